@@ -132,8 +132,10 @@ class CaptureGameState(AbstractGameState):
 
         if (self.isOnRedSide((x, y))):
             self._redFood[x][y] = False
+            self._redFood._hash = None
         else:
             self._blueFood[x][y] = False
+            self._blueFood._hash = None
 
     def getBlueCapsules(self):
         """
@@ -101,6 +101,9 @@ class AbstractGameState(abc.ABC):
         self._food[x][y] = False
         self._lastFoodEaten = (x, y)
 
+        # The cell write above bypasses the grid's hash cache, so clear it here.
+        self._food._hash = None
+
         self._hash = None
         return True
 
@@ -272,6 +275,12 @@ class AbstractGameState(abc.ABC):
         if (type(self) != type(other)):
             return False
 
+        # Computed hashes that disagree mean the states cannot be equal,
+        # which skips the expensive field comparisons below on most lookup misses.
+        if (self._hash is not None and other._hash is not None
+                and self._hash != other._hash):
+            return False
+
         # Note that not all fields are being used because we are checking if two states are equal,
         # not is they got to this confiruation in the same way.
 
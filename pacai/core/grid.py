@@ -13,6 +13,11 @@ class Grid:
         self._height = height
         self._data = [[initialValue for y in range(height)] for x in range(width)]
 
+        # Keep a copy of the hash, since computing it walks the whole grid.
+        # Writes through __setitem__ clear it, but cell-level writes (grid[x][y] = value)
+        # bypass this class, so code doing those must clear the hash itself.
+        self._hash = None
+
     def asList(self, key = True):
         values = []
 
@@ -61,6 +66,9 @@ class Grid:
         return self._data[i]
 
     def __hash__(self):
+        if (self._hash is not None):
+            return self._hash
+
         hashcode = 0
         base = 1
 
@@ -70,12 +78,14 @@ class Grid:
                     hashcode += base
                 base *= 2
 
-        return hash(hashcode)
+        self._hash = hash(hashcode)
+        return self._hash
 
     def __lt__(self, other):
         return self.__hash__() < other.__hash__()
 
     def __setitem__(self, key, item):
+        self._hash = None
         self._data[key] = item
 
     def __str__(self):
@@ -1,11 +1,90 @@
 from cmath import inf
+import multiprocessing
+import os
+import pickle
 import random
+import time
+import weakref
 
 from pacai.agents.base import BaseAgent
 from pacai.agents.search.multiagent import MultiAgentSearchAgent
+from pacai.core.actions import Actions
 from pacai.core.distance import manhattan
 from pacai.core.directions import Directions
 
+# transposition table flags describing what a stored value means:
+# an exact minimax value, a lower bound (beta cutoff), or an upper bound (alpha cutoff)
+TT_EXACT = 0
+TT_LOWER = 1
+TT_UPPER = 2
+
+def _legalActionsNoStop(gameState, agent):
+    """
+    `getLegalActions` with STOP filtered out, cached on the state.
+    The same state gets probed repeatedly once the transposition tables and
+    move hints are in play, and this skips both the legal-move generation
+    and the STOP scan on every revisit. The cache carries a weak reference
+    to its owning state because successors are built with copy.copy and
+    would otherwise inherit their parent's entries. Returns a shared tuple,
+    so callers must not mutate it.
+    """
+
+    cache = getattr(gameState, '_legalNoStop', None)
+    if cache is None or cache[0]() is not gameState:
+        cache = (weakref.ref(gameState), {})
+        gameState._legalNoStop = cache
+
+    actions = cache[1].get(agent)
+    if actions is None:
+        actions = tuple(action for action in gameState.getLegalActions(agent)
+                if action != Directions.STOP)
+        cache[1][agent] = actions
+
+    return actions
+
+def _closestDistance(position, positions):
+    """
+    Manhattan distance from position to the closest of positions
+    (inf when positions is empty).
+    The arithmetic is inlined in one tight loop rather than calling
+    manhattan per element, since this runs once per evaluated state.
+    """
+
+    (px, py) = position
+    best = inf
+
+    for (x, y) in positions:
+        d = abs(px - x) + abs(py - y)
+        if d < best:
+            best = d
+
+    return best
+
+def canonicalTTKey(gameState, agent, depth):
+    """
+    Transposition key that collapses interchangeable ghosts.
+    Ghosts are identical minimizers, so two states that differ only by a
+    permutation of whole ghost states (position, direction, and scared
+    timer all swapped together) usually have the same search value.
+    The exception is a ghost that can be eaten inside the horizon:
+    it respawns at its own agent-index's start cell, which a sorted key
+    erases. So ghost entries are only sorted when no ghost is scared and
+    no capsules remain, meaning none can become edible within the search.
+    """
+
+    pacman = gameState.getPacmanState()
+    capsules = tuple(gameState.getCapsules())
+    ghosts = tuple((ghost._position, ghost._direction, ghost._scaredTimer)
+            for ghost in gameState.getGhostStates())
+
+    if not capsules and not any(entry[2] for entry in ghosts):
+        ghosts = tuple(sorted(ghosts))
+
+    # key on the state's own copy-on-write grid rather than getFood(),
+    # which returns a fresh copy (with a cold hash) on every call
+    return (agent, depth, pacman.getPosition(), pacman.getDirection(), ghosts,
+        gameState._food, capsules, gameState.getScore())
+
 
 class ReflexAgent(BaseAgent):
     """
@@ -55,32 +134,22 @@ class ReflexAgent(BaseAgent):
         in your evaluation function.
         """
 
-        successorGameState = currentGameState.generatePacmanSuccessor(action)
+        # pacman's successor position is fully determined by the current state
+        # and the action, so compute it directly instead of cloning the state
+        (x, y) = currentGameState.getPacmanPosition()
+        (dx, dy) = Actions.directionToVector(action, 1)
+        newPosition = (x + dx, y + dy)
 
-        newPosition = successorGameState.getPacmanPosition()
         oldFood = currentGameState.getFood().asList()
-        newGhostStates = successorGameState.getGhostStates()
-        # newScaredTimes = [ghostState.getScaredTimer() for ghostState in newGhostStates]
-
-        # find distances to each ghost
-        ghostDistances = []
-        for ghost in newGhostStates:
-            ghostDistances.append(manhattan(newPosition, ghost._position))
+        ghostStates = currentGameState.getGhostStates()
 
         # find the distance to the closest food and return it as eval
         # distance is negated since smaller numbers are defined as better options
-        foodDistances = []
-        for food in oldFood:
-            if food:
-                d = manhattan(newPosition, food)
-                foodDistances.append(d)
-        foodDistances.sort()
-        eval = -foodDistances[0]
-
-        # avoid running into ghosts at all costs
-        for ghostDistance in ghostDistances:
-            if ghostDistance < 2:
-                eval = -999999
+        eval = -_closestDistance(newPosition, oldFood)
+
+        # avoid running into ghosts at all costs (ghosts have not moved yet)
+        if _closestDistance(newPosition, [ghost._position for ghost in ghostStates]) < 2:
+            eval = -999999
 
         return eval
 
@@ -115,83 +184,148 @@ class MinimaxAgent(MultiAgentSearchAgent):
         and `pacai.agents.search.multiagent.MultiAgentSearchAgent.getEvaluationFunction`.
         """
 
+        # transposition table for this move, keyed by (state, agent, depth)
+        self._tt = {}
+
         # find max for pacman
-        _, action = self.maxValue(gameState, 0, 0)
+        _, action = self.minimax(gameState)
         return action
 
-    def maxValue(self, gameState, agent, depth):
+    def minimax(self, rootState):
         """
-        Maximize for pacman's turn
+        Depth-limited minimax run on an explicit stack of frames instead of
+        recursion, so the hot path pays no Python call frame per node.
+        Pacman (agent 0) maximizes and ghosts minimize.
+        Returns the root's (value, action).
         """
-        legalActions = gameState.getLegalActions(agent)
 
-        if Directions.STOP in legalActions:
-            legalActions.remove(Directions.STOP)
+        # bind the hot lookups to locals once,
+        # so the per-node loop runs on plain local loads
+        treeDepth = self.getTreeDepth()
+        numAgents = rootState.getNumAgents()
+        tt = self._tt
+        evaluate = self._evaluationFunction
+
+        # frame:
+        # [0] = (state, agent, depth) transposition key;
+        # [1] = state;
+        # [2] = agent;
+        # [3] = depth;
+        # [4] = iterator over the remaining legal actions;
+        # [5] = best value so far;
+        # [6] = best action so far;
+        # [7] = action whose child value is pending
+        stack = []
+
+        # (value, action) coming back from a finished child, None while descending
+        returned = None
+
+        def open(state, agent, depth):
+            """
+            Enter a node: resolve it immediately into `returned` if it is a
+            memoized or terminal node, otherwise push a frame for it.
+            """
+
+            nonlocal returned
+
+            # identical positions recur through different move orderings,
+            # so return the memoized value instead of searching again.
+            # keying shallow nodes costs more than recomputing them,
+            # so the table only covers nodes with at least two plies below
+            key = None
+            if treeDepth - depth >= 2:
+                key = canonicalTTKey(state, agent, depth)
+                if key in tt:
+                    returned = tt[key]
+                    return
+
+            legalActions = _legalActionsNoStop(state, agent)
+
+            # max depth reached or no valid actions left, return eval func
+            if depth == treeDepth or not legalActions:
+                returned = (evaluate(state), None)
+                return
+
+            best = -inf if agent == 0 else inf
+            stack.append([key, state, agent, depth, iter(legalActions), best, None, None])
+            returned = None
+
+        open(rootState, 0, 0)
+
+        while stack:
+            frame = stack[-1]
+
+            # fold a finished child's value into this node's running best
+            if returned is not None:
+                value = returned[0]
+                returned = None
+
+                if frame[2] == 0:
+                    if value > frame[5]:
+                        frame[5], frame[6] = value, frame[7]
+                elif value < frame[5]:
+                    frame[5], frame[6] = value, frame[7]
+
+            action = next(frame[4], None)
+            if action is None:
+                # node finished: memoize and hand its result up to the parent
+                result = (frame[5], frame[6])
+                if frame[0] is not None:
+                    tt[frame[0]] = result
+                stack.pop()
+                returned = result
+                continue
+
+            # descend into the next child
+            frame[7] = action
+            nextAgent = (frame[2] + 1) % numAgents
+            nextDepth = frame[3] + 1 if nextAgent == 0 else frame[3]
+            open(frame[1].generateSuccessor(frame[2], action), nextAgent, nextDepth)
+
+        return returned
 
-        # max depth reached or no valid actions left, return eval func
-        if depth == self.getTreeDepth() or not legalActions:
-            return self._evaluationFunction(gameState), None
 
-        bestValue = -inf
-        bestAction = None
-        # find action with max value
-        for action in legalActions:
-            successorGameState = gameState.generateSuccessor(agent, action)
-            nextAgent = (agent + 1) % gameState.getNumAgents()
+class AlphaBetaAgent(MultiAgentSearchAgent):
+    """
+    A minimax agent with alpha-beta pruning.
+    The search runs iterative deepening up to the configured tree depth,
+    optionally under a wall-clock budget (pass `timeBudget` in seconds).
+    """
 
-            # call max/min depending on if next agent is pacman or ghost
-            if nextAgent == 0:
-                value, _ = self.maxValue(
-                    successorGameState, nextAgent, depth + 1)
-            else:
-                value, _ = self.minValue(
-                    successorGameState, nextAgent, depth)
+    def __init__(self, index, timeBudget = None, **kwargs):
+        super().__init__(index, **kwargs)
 
-            if value > bestValue:
-                bestValue, bestAction = value, action
+        self._timeBudget = None
+        if timeBudget is not None:
+            self._timeBudget = float(timeBudget)
 
-        return bestValue, bestAction
+        # best move found the last time each state was searched,
+        # kept across moves so earlier searches seed the ordering of later ones.
+        # keyed by state hash so the dict holds small ints instead of pinning
+        # every searched state in memory; a colliding hint is harmless since
+        # hints are checked against the legal actions and only affect ordering
+        self._bestMoveHint = {}
 
-    def minValue(self, gameState, agent, depth):
+    def orderedSuccessors(self, gameState, agent, legalActions):
         """
-        Minimize for ghosts' turn
+        Yield (successor, action) pairs, the remembered best move first.
+        Alpha-beta only approaches its best case (branching factor ~sqrt(b))
+        when good moves come early, and a cutoff on the hint move costs a
+        single successor. The rest keep the engine's move order: sorting
+        them by a shallow evaluation ran the full evaluation on every
+        child of every interior node (twice for the children about to be
+        searched as leaves) and cost more than the cutoffs it bought.
         """
-        legalActions = gameState.getLegalActions(agent)
-        if Directions.STOP in legalActions:
-            legalActions.remove(Directions.STOP)
 
-        # max depth reached or no valid actions left, return eval func
-        if depth == self.getTreeDepth() or not legalActions:
-            return self._evaluationFunction(gameState), None
+        hint = self._bestMoveHint.get(hash(gameState))
+        if hint is not None and hint in legalActions:
+            yield (gameState.generateSuccessor(agent, hint), hint)
 
-        bestValue = inf
-        bestAction = None
-        # find action with max value
+        # one successor at a time, so a cutoff in the caller's loop
+        # skips the children it never gets to
         for action in legalActions:
-            successorGameState = gameState.generateSuccessor(agent, action)
-            nextAgent = (agent + 1) % gameState.getNumAgents()
-
-            # call max/min depending on if next agent is pacman or ghost
-            if nextAgent == 0:
-                value, _ = self.maxValue(
-                    successorGameState, nextAgent, depth + 1)
-            else:
-                value, _ = self.minValue(
-                    successorGameState, nextAgent, depth)
-
-            if value < bestValue:
-                bestValue, bestAction = value, action
-
-        return bestValue, bestAction
-
-
-class AlphaBetaAgent(MultiAgentSearchAgent):
-    """
-    A minimax agent with alpha-beta pruning.
-    """
-
-    def __init__(self, index, **kwargs):
-        super().__init__(index, **kwargs)
+            if action != hint:
+                yield (gameState.generateSuccessor(agent, action), action)
 
     def getAction(self, gameState):
         """
@@ -200,81 +334,162 @@ class AlphaBetaAgent(MultiAgentSearchAgent):
         and `pacai.agents.search.multiagent.MultiAgentSearchAgent.getEvaluationFunction`.
         """
 
-        # find max for pacman
-        _, action = self.maxValue(gameState, 0, 0, -inf, inf)
-        return action
-
-    def maxValue(self, gameState, agent, depth, alpha, beta):
-        """
-        Maximize for pacman's turn with a-B pruning
-        """
-        legalActions = gameState.getLegalActions(agent)
+        # without a budget nobody is waiting on an early answer,
+        # and the shallow passes only repeat work, so search the full depth once
+        if self._timeBudget is None:
+            self._tt = {}
 
-        if Directions.STOP in legalActions:
-            legalActions.remove(Directions.STOP)
+            # find max for pacman
+            _, action = self.searchValue(gameState, 0, 0, -inf, inf, self.getTreeDepth())
+            return action
 
-        # max depth reached or no valid actions left, return eval func
-        if depth == self.getTreeDepth() or not legalActions:
-            return self._evaluationFunction(gameState), None
+        deadline = time.monotonic() + self._timeBudget
 
-        bestValue = -inf
+        # iterative deepening: search depth 1, 2, ... up to the tree depth.
+        # each pass leaves best-move hints behind that order the next,
+        # deeper pass, and the last completed pass always has an answer ready
+        # if the time budget runs out
         bestAction = None
-        # find action with max value
-        for action in legalActions:
-            successorGameState = gameState.generateSuccessor(agent, action)
-            nextAgent = (agent + 1) % gameState.getNumAgents()
+        for limit in range(1, self.getTreeDepth() + 1):
+            # leaf values depend on the depth limit, so the table cannot
+            # carry over between passes
+            self._tt = {}
 
-            # call max/min depending on if next agent is pacman or ghost
-            if nextAgent == 0:
-                value, _ = self.maxValue(
-                    successorGameState, nextAgent, depth + 1, alpha, beta)
-            else:
-                value, _ = self.minValue(
-                    successorGameState, nextAgent, depth, alpha, beta)
+            # find max for pacman
+            _, action = self.searchValue(gameState, 0, 0, -inf, inf, limit)
+            if action is not None:
+                bestAction = action
 
-            if value > bestValue:
-                bestValue, bestAction = value, action
-                alpha = max(alpha, value)
+            if time.monotonic() >= deadline:
+                break
 
-            if value >= beta:
-                return value, action
+        return bestAction
 
-        return bestValue, bestAction
+    def ttLookup(self, key, alpha, beta):
+        """
+        Probe the transposition table.
+        Returns (value, action, alpha, beta) where value is None on a miss.
+        Exact entries are returned directly,
+        while bound entries tighten the window (and may cut off immediately).
+        """
+
+        entry = self._tt.get(key)
+        if entry is None:
+            return None, None, alpha, beta
+
+        value, action, flag = entry
+        if flag == TT_EXACT:
+            return value, action, alpha, beta
+        elif flag == TT_LOWER:
+            alpha = max(alpha, value)
+        else:
+            beta = min(beta, value)
 
-    def minValue(self, gameState, agent, depth, alpha, beta):
+        # the stored bound alone is enough to prune this node
+        if alpha >= beta:
+            return value, action, alpha, beta
+
+        return None, None, alpha, beta
+
+    def searchValue(self, gameState, agent, depth, alpha, beta, limit):
         """
-        Minimize for ghosts' turn with a-B prunin
+        Fail-soft alpha-beta for every agent in a single routine:
+        pacman (agent 0) maximizes and each ghost minimizes,
+        so a flag picks the comparisons instead of mirrored
+        maxValue/minValue methods. A true negamax sign flip does not fit
+        here because consecutive ghost layers all minimize.
+
+        After the first (best-ordered) child, the rest are probed with a
+        null window (principal variation search); only a probe that fails
+        back inside the window is re-searched at full width.
         """
-        legalActions = gameState.getLegalActions(agent)
-        if Directions.STOP in legalActions:
-            legalActions.remove(Directions.STOP)
+
+        # bind the recursion and tables to locals once per node,
+        # saving repeated attribute lookups in the loop below
+        search = self.searchValue
+        tt = self._tt
+        hints = self._bestMoveHint
+
+        # keying shallow nodes costs more than recomputing them,
+        # so the table only covers nodes with at least two plies below
+        key = None
+        if limit - depth >= 2:
+            key = canonicalTTKey(gameState, agent, depth)
+            value, action, alpha, beta = self.ttLookup(key, alpha, beta)
+            if value is not None:
+                return value, action
+
+        legalActions = _legalActionsNoStop(gameState, agent)
 
         # max depth reached or no valid actions left, return eval func
-        if depth == self.getTreeDepth() or not legalActions:
+        if depth == limit or not legalActions:
             return self._evaluationFunction(gameState), None
 
-        bestValue = inf
-        bestAction = None
-        # find action with max value
-        for action in legalActions:
-            successorGameState = gameState.generateSuccessor(agent, action)
-            nextAgent = (agent + 1) % gameState.getNumAgents()
-
-            # call max/min depending on if next agent is pacman or ghost
-            if nextAgent == 0:
-                value, _ = self.maxValue(
-                    successorGameState, nextAgent, depth + 1, alpha, beta)
-            else:
-                value, _ = self.minValue(
-                    successorGameState, nextAgent, depth, alpha, beta)
+        maximizing = (agent == 0)
+        nextAgent = (agent + 1) % gameState.getNumAgents()
+        nextDepth = depth + 1 if nextAgent == 0 else depth
 
-            if value < bestValue:
-                bestValue, bestAction = value, action
-                beta = min(beta, value)
+        # remember the entry window so the final table entry gets the right flag
+        alphaIn, betaIn = alpha, beta
 
-            if value <= alpha:
-                return value, action
+        bestValue = -inf if maximizing else inf
+        bestAction = None
+        first = True
+        # find the best action, best-looking moves first
+        for successorGameState, action in self.orderedSuccessors(
+                gameState, agent, legalActions):
+            if first:
+                value, _ = search(
+                    successorGameState, nextAgent, nextDepth, alpha, beta, limit)
+                first = False
+            elif maximizing:
+                # null-window probe: can this child beat alpha at all?
+                value, _ = search(
+                    successorGameState, nextAgent, nextDepth, alpha, alpha + 1, limit)
+                if alpha < value < beta:
+                    value, _ = search(
+                        successorGameState, nextAgent, nextDepth, value, beta, limit)
+            else:
+                value, _ = search(
+                    successorGameState, nextAgent, nextDepth, beta - 1, beta, limit)
+                if alpha < value < beta:
+                    value, _ = search(
+                        successorGameState, nextAgent, nextDepth, alpha, value, limit)
+
+            if maximizing:
+                if value > bestValue:
+                    bestValue, bestAction = value, action
+                    alpha = max(alpha, value)
+
+                if value >= beta:
+                    # the cutoff value is only a lower bound on the true value
+                    if key is not None:
+                        tt[key] = (value, action, TT_LOWER)
+                    hints[hash(gameState)] = action
+                    return value, action
+            else:
+                if value < bestValue:
+                    bestValue, bestAction = value, action
+                    beta = min(beta, value)
+
+                if value <= alpha:
+                    # the cutoff value is only an upper bound on the true value
+                    if key is not None:
+                        tt[key] = (value, action, TT_UPPER)
+                    hints[hash(gameState)] = action
+                    return value, action
+
+        # a value outside the entry window is only a bound, not exact
+        if bestValue <= alphaIn:
+            flag = TT_UPPER
+        elif bestValue >= betaIn:
+            flag = TT_LOWER
+        else:
+            flag = TT_EXACT
 
+        if key is not None:
+            tt[key] = (bestValue, bestAction, flag)
+        hints[hash(gameState)] = bestAction
         return bestValue, bestAction
 
 
@@ -283,11 +498,24 @@ class ExpectimaxAgent(MultiAgentSearchAgent):
     An expectimax agent.
 
     All ghosts should be modeled as choosing uniformly at random from their legal moves.
+
+    When the evaluation function's range is known, pass `evalLower` and
+    `evalUpper` as agent args to enable star1 pruning: a chance node is cut
+    as soon as even the best (or worst) possible completion of its remaining
+    children cannot move the expectation back inside the search window.
+    Without bounds, every chance child is evaluated exactly as before.
     """
 
-    def __init__(self, index, **kwargs):
+    def __init__(self, index, evalLower = None, evalUpper = None, **kwargs):
         super().__init__(index, **kwargs)
 
+        self._evalLower = float(evalLower) if (evalLower is not None) else -inf
+        self._evalUpper = float(evalUpper) if (evalUpper is not None) else inf
+
+        # pruning needs both bounds to be finite,
+        # otherwise the completion estimates are meaningless
+        self._starPruning = (evalLower is not None and evalUpper is not None)
+
     def getAction(self, gameState):
         """
         Returns the minimax action from the current gameState using
@@ -295,9 +523,10 @@ class ExpectimaxAgent(MultiAgentSearchAgent):
         and `pacai.agents.search.multiagent.MultiAgentSearchAgent.getEvaluationFunction`.
         """
 
-        legalActions = gameState.getLegalActions(0)
-        if Directions.STOP in legalActions:
-            legalActions.remove(Directions.STOP)
+        # transposition table for this move, keyed by (state, agent, depth)
+        self._tt = {}
+
+        legalActions = _legalActionsNoStop(gameState, 0)
 
         # return stop if there are no legal options (not reached in q4)
         if not legalActions:
@@ -307,48 +536,191 @@ class ExpectimaxAgent(MultiAgentSearchAgent):
         bestValue = -inf
         bestAction = None
 
-        # for each action find best expected score, return best action
+        # for each action find best expected score, return best action.
+        # the running best doubles as alpha for the chance children
         for action in legalActions:
             successorGameState = gameState.generateSuccessor(0, action)
-            expectedValue = self.expectimaxValue(successorGameState, 1, 0)
+            expectedValue = self.expectimaxValue(successorGameState, 1, 0, bestValue, inf)
 
             if expectedValue > bestValue:
                 bestValue, bestAction = expectedValue, action
 
         return bestAction
 
-    def expectimaxValue(self, gameState, agent, depth):
+    def expectimaxValue(self, gameState, agent, depth, alpha = -inf, beta = inf):
         """
-        Expected value for ghosts' turn
+        Max value for pacman's turn, expected value for ghosts' turn.
+        With eval bounds configured, (alpha, beta) prune chance nodes whose
+        remaining children cannot bring the expectation back into the window;
+        a pruned value is only a bound, which its table flag records.
         """
-        legalActions = gameState.getLegalActions(agent)
-        if Directions.STOP in legalActions:
-            legalActions.remove(Directions.STOP)
+
+        # keying shallow nodes costs more than recomputing them,
+        # so the table only covers nodes with at least two plies below
+        key = None
+        if self.getTreeDepth() - depth >= 2:
+            key = canonicalTTKey(gameState, agent, depth)
+            entry = self._tt.get(key)
+            if entry is not None:
+                (value, flag) = entry
+                if flag == TT_EXACT:
+                    return value
+                elif flag == TT_LOWER:
+                    if value >= beta:
+                        return value
+                    alpha = max(alpha, value)
+                else:
+                    if value <= alpha:
+                        return value
+                    beta = min(beta, value)
+
+        legalActions = _legalActionsNoStop(gameState, agent)
 
         # max depth reached or no valid actions left, return eval func
         if depth == self.getTreeDepth() or not legalActions:
             return self._evaluationFunction(gameState)
 
-        values = []
-        expectedValue = None
-        # find all values for legal moves
+        nextAgent = (agent + 1) % gameState.getNumAgents()
+        nextDepth = depth + 1 if nextAgent == 0 else depth
+
+        # max value for pacman
+        if agent == 0:
+            alphaIn = alpha
+            best = -inf
+            for action in legalActions:
+                value = self.expectimaxValue(
+                    gameState.generateSuccessor(agent, action),
+                    nextAgent, nextDepth, alpha, beta)
+
+                if value > best:
+                    best = value
+                    alpha = max(alpha, value)
+
+                if value >= beta:
+                    if key is not None:
+                        self._tt[key] = (value, TT_LOWER)
+                    return value
+
+            # a best below the entry alpha may rest on pruned children,
+            # so it is only an upper bound
+            flag = TT_UPPER if best <= alphaIn else TT_EXACT
+            if key is not None:
+                self._tt[key] = (best, flag)
+            return best
+
+        # expected value for ghosts
+        n = len(legalActions)
+        lower = self._evalLower
+        upper = self._evalUpper
+        total = 0.0
+        remaining = n
+
         for action in legalActions:
-            successorGameState = gameState.generateSuccessor(agent, action)
-            nextAgent = (agent + 1) % gameState.getNumAgents()
-            nextDepth = depth + 1 if nextAgent == 0 else depth
+            remaining -= 1
+
+            if self._starPruning:
+                # the tightest window the child's value must land in
+                # for this node's expectation to stay inside (alpha, beta)
+                childAlpha = n * alpha - total - remaining * upper
+                childBeta = n * beta - total - remaining * lower
+            else:
+                childAlpha, childBeta = -inf, inf
 
             value = self.expectimaxValue(
-                successorGameState, nextAgent, nextDepth)
-            values.append(value)
+                gameState.generateSuccessor(agent, action),
+                nextAgent, nextDepth, childAlpha, childBeta)
+
+            if self._starPruning:
+                if value <= childAlpha:
+                    # even the best completion of the rest stays below alpha
+                    result = (total + value + remaining * upper) / n
+                    if key is not None:
+                        self._tt[key] = (result, TT_UPPER)
+                    return result
+
+                if value >= childBeta:
+                    # even the worst completion of the rest stays above beta
+                    result = (total + value + remaining * lower) / n
+                    if key is not None:
+                        self._tt[key] = (result, TT_LOWER)
+                    return result
+
+            total += value
+
+        expectedValue = total / n
+        if key is not None:
+            self._tt[key] = (expectedValue, TT_EXACT)
+        return expectedValue
 
-        # return max value for pacman, expected for ghosts
-        if agent == 0:
-            expectedValue = max(values)
-        else:
-            expectedValue = (float(sum(values)) / float(len(legalActions)))
 
-        return expectedValue
+# lazily-built maze distance tables, keyed by the walls grid object.
+# maps each queried source cell to the BFS distances to every reachable cell,
+# so repeated eval calls pay O(1) per lookup instead of a BFS per pair
+_mazeDistanceCache = [None, None]
+
+def _bfsDistances(source, walls):
+    """
+    Single-source BFS over the walls grid,
+    returning a dict of maze distances to every reachable cell.
+    """
+
+    distances = {source: 0}
+    frontier = [source]
+
+    # the frontier list grows while it is being walked
+    for (x, y) in frontier:
+        d = distances[(x, y)] + 1
+
+        for neighbor in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if neighbor not in distances and not walls[neighbor[0]][neighbor[1]]:
+                distances[neighbor] = d
+                frontier.append(neighbor)
+
+    return distances
+
+def _mazeDistance(position1, position2, walls):
+    """
+    True maze distance between two cells, served from the cached tables.
+    Falls back to manhattan distance for positions that are mid-move
+    (not on a grid cell) or walled off.
+    """
+
+    if (position1[0] != int(position1[0]) or position1[1] != int(position1[1])
+            or position2[0] != int(position2[0]) or position2[1] != int(position2[1])):
+        return manhattan(position1, position2)
+
+    if _mazeDistanceCache[0] is not walls:
+        _mazeDistanceCache[0] = walls
+        _mazeDistanceCache[1] = {}
 
+    source = (int(position1[0]), int(position1[1]))
+    table = _mazeDistanceCache[1].get(source)
+    if table is None:
+        table = _bfsDistances(source, walls)
+        _mazeDistanceCache[1][source] = table
+
+    distance = table.get((int(position2[0]), int(position2[1])))
+    if distance is None:
+        return manhattan(position1, position2)
+
+    return distance
+
+# single-entry cache for the last food grid converted to a position list.
+# successor states share their parent's food grid copy-on-write,
+# so most eval calls in a search see the exact same grid object
+_foodListCache = [None, None]
+
+def _foodAsList(food):
+    """
+    Convert a food grid to a list of positions,
+    reusing the last conversion when the same grid object comes back.
+    """
+
+    if _foodListCache[0] is not food:
+        _foodListCache[0] = food
+        _foodListCache[1] = food.asList()
+
+    return _foodListCache[1]
 
 def betterEvaluationFunction(currentGameState):
     """
@@ -371,38 +743,76 @@ def betterEvaluationFunction(currentGameState):
     It maximizes the penalty for running into ghosts unless they are scared.
     """
 
+    # pull everything needed out of the state once up front.
+    # the food list comes from the state's own copy-on-write grid,
+    # since getFood() returns a fresh copy that would never hit the cache
     position = currentGameState.getPacmanPosition()
-    foodList = currentGameState.getFood().asList()
+    foodList = _foodAsList(currentGameState._food)
     ghosts = currentGameState.getGhostStates()
     capsules = currentGameState.getCapsules()
+    walls = currentGameState.getWalls()
 
     # find distances to each ghost
     ghostDistances = []
     scaredTimer = 0
     for ghost in ghosts:
         scaredTimer = ghost._scaredTimer
-        ghostDistances.append(manhattan(position, ghost._position))
+        ghostDistances.append(_mazeDistance(position, ghost._position, walls))
 
     # finished eating food, done
     if not foodList:
         return currentGameState.getScore()
 
-    # find the distance to the closest food and return it as eval
-    foodDistances = []
-    for food in foodList:
-        foodDistances.append(manhattan(position, food))
-
-    eval = min(foodDistances)
+    # find the distance to the closest food in one pass and return it as eval.
+    # maze distances avoid chasing food through walls
+    eval = min(_mazeDistance(position, food, walls) for food in foodList)
 
     # avoid running into ghosts at all costs unless scared
-    if scaredTimer < 1:
-        for ghostDistance in ghostDistances:
-            if ghostDistance < 1:
-                eval = 999999
+    if scaredTimer < 1 and min(ghostDistances, default = inf) < 1:
+        eval = 999999
 
     return currentGameState.getScore() - eval - (50 * len(capsules)) - (10 * len(foodList))
 
 
+def _contestSearch(job):
+    """
+    Worker for `ContestAgent` root parallelization:
+    score every root action with an independently seeded alpha-beta search.
+    Runs in a separate process, so everything it needs rides in the job tuple
+    (seed, gameState, depth, budget in seconds).
+    Returns a dict of action -> value from the deepest pass that finished in budget.
+    """
+
+    (seed, gameState, depth, budget) = job
+    random.seed(seed)
+    deadline = time.monotonic() + budget
+
+    searcher = AlphaBetaAgent(0, depth = depth,
+        evalFn = 'pacai.student.multiagents.betterEvaluationFunction')
+
+    # a different shuffle per worker breaks ties differently,
+    # so the workers explore the root moves in different orders
+    legalActions = list(_legalActionsNoStop(gameState, 0))
+    random.shuffle(legalActions)
+
+    scores = {}
+    for limit in range(1, depth + 1):
+        searcher._tt = {}
+        current = {}
+
+        for action in legalActions:
+            value, _ = searcher.searchValue(
+                gameState.generateSuccessor(0, action), 1, 0, -inf, inf, limit)
+            current[action] = value
+
+            if time.monotonic() >= deadline:
+                # out of time mid-pass, keep the last completed pass
+                return scores if scores else current
+
+        scores = current
+
+    return scores
+
 class ContestAgent(MultiAgentSearchAgent):
     """
     Your agent for the mini-contest.
@@ -416,7 +826,56 @@ class ContestAgent(MultiAgentSearchAgent):
     Method to Implement:
 
     `pacai.agents.base.BaseAgent.getAction`
+
+    This agent runs root parallelization: a pool of worker processes each
+    searches the current position with its own move ordering and random
+    seed, and the workers' root scores are summed to pick the move.
+    `numWorkers` and `timeBudget` (seconds per move) can be set as agent args.
     """
 
-    def __init__(self, index, **kwargs):
-        super().__init__(index, **kwargs)
+    def __init__(self, index, numWorkers = None, timeBudget = 0.4, depth = 3, **kwargs):
+        super().__init__(index, depth = depth, **kwargs)
+
+        self._numWorkers = int(numWorkers) if (numWorkers is not None) \
+            else min(4, os.cpu_count() or 1)
+        self._timeBudget = float(timeBudget)
+        self._pool = None
+
+    def getAction(self, gameState):
+        legalActions = [action for action in gameState.getLegalActions(0)
+                if action != Directions.STOP]
+
+        if not legalActions:
+            return Directions.STOP
+
+        if len(legalActions) == 1:
+            return legalActions[0]
+
+        # the legal-action cache holds a weakref, which cannot be pickled,
+        # so strip it before the state is shipped to the workers
+        gameState.__dict__.pop('_legalNoStop', None)
+
+        jobs = [(seed, gameState, self.getTreeDepth(), self._timeBudget)
+                for seed in range(self._numWorkers)]
+
+        try:
+            if self._pool is None:
+                self._pool = multiprocessing.Pool(self._numWorkers)
+
+            results = self._pool.map(_contestSearch, jobs)
+        except (OSError, TypeError, pickle.PicklingError):
+            # no subprocesses available, search alone instead
+            results = [_contestSearch(jobs[0])]
+
+        # vote: sum each action's score across the workers
+        totals = {}
+        for scores in results:
+            for (action, value) in scores.items():
+                totals[action] = totals.get(action, 0) + value
+
+        return max(totals, key = totals.get)
+
+    def final(self, state):
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool = None
@@ -2,7 +2,10 @@
 In this file, you will implement generic search algorithms which are called by Pacman agents.
 """
 
-from pacai.util import queue
+import heapq
+
+from collections import deque
+from math import inf
 
 
 def depthFirstSearch(problem):
@@ -32,52 +35,117 @@ def breadthFirstSearch(problem):
 
     # node:
     # [0] = state;
-    # [1] = actions from start to state;
-    # [2] = cost (unused)
+    # [1] = index of this node's entry in parents
 
     if problem.isGoal(problem.startingState()):
         return []
 
-    frontier = queue.Queue()
-    reached = []
+    # a bare deque avoids the per-operation method dispatch of the Queue
+    # wrapper (whose list-based push is also O(n))
+    frontier = deque()
+    reached = {problem.startingState()}
 
-    node = (problem.startingState(), [], 0)
-    frontier.push(node)
+    # each reached state gets a (parent index, action) entry in parents,
+    # so paths are rebuilt once at the goal instead of copied on every push
+    parents = [(-1, None)]
+    frontier.append((problem.startingState(), 0))
 
     # pop off from frontier until no possible solution can be found
-    while not frontier.isEmpty():
-        node = frontier.pop()
+    while frontier:
+        (state, index) = frontier.popleft()
 
-        # skip explored paths
-        if node[0] in reached:
-            continue
+        # path found, walk the parent chain back to the start
+        if problem.isGoal(state):
+            actions = []
+            while parents[index][1] is not None:
+                actions.append(parents[index][1])
+                index = parents[index][0]
 
-        # path found
-        if problem.isGoal(node[0]):
-            return node[1]
+            actions.reverse()
+            return actions
 
-        reached.append(node[0])
-        expand = problem.successorStates(node[0])
+        expand = problem.successorStates(state)
 
-        # add each successor to frontier with an additional action
+        # add each unreached successor to frontier with an additional action.
+        # states are marked reached at push time so duplicates never get enqueued
         for child in expand:
-            childNode = (child[0], node[1] + [child[1]], 0)
-            frontier.push(childNode)
+            if child[0] not in reached:
+                reached.add(child[0])
+                parents.append((index, child[1]))
+                frontier.append((child[0], len(parents) - 1))
 
     return None
 
 def uniformCostSearch(problem):
     """
     Search the node of least total cost first.
+    Identical to A* with a zero heuristic.
     """
 
-    # *** Your Code Here ***
-    raise NotImplementedError()
+    return aStarSearch(problem, lambda state, problem = None: 0)
 
 def aStarSearch(problem, heuristic):
     """
     Search the node that has the lowest combined cost and heuristic first.
+
+    The frontier is a raw heapq binary heap rather than a wrapper class,
+    with a best-cost dict standing in for decrease-key:
+    outdated entries stay in the heap and are skipped when popped.
     """
 
-    # *** Your Code Here ***
-    raise NotImplementedError()
+    start = problem.startingState()
+
+    if problem.isGoal(start):
+        return []
+
+    # heuristics like maze distance are expensive, so cache them per state
+    hCache = {start: heuristic(start, problem)}
+
+    # cheapest path cost found to each state so far
+    bestCost = {start: 0}
+
+    # parents works like in breadthFirstSearch: (parent index, action) entries,
+    # and the entry index doubles as a unique heap tiebreaker so states
+    # never need to be compared
+    parents = [(-1, None)]
+
+    # frontier entry:
+    # [0] = cost + heuristic;
+    # [1] = index of this node's entry in parents;
+    # [2] = state;
+    # [3] = cost from start to state
+    frontier = [(hCache[start], 0, start, 0)]
+
+    while frontier:
+        (_, index, state, cost) = heapq.heappop(frontier)
+
+        # a cheaper path to this state was pushed after this entry, skip it
+        if cost > bestCost.get(state, cost):
+            continue
+
+        # path found, walk the parent chain back to the start
+        if problem.isGoal(state):
+            actions = []
+            while parents[index][1] is not None:
+                actions.append(parents[index][1])
+                index = parents[index][0]
+
+            actions.reverse()
+            return actions
+
+        # push each successor that improves on the best known path to it
+        for child in problem.successorStates(state):
+            childCost = cost + child[2]
+
+            if childCost < bestCost.get(child[0], inf):
+                bestCost[child[0]] = childCost
+
+                h = hCache.get(child[0])
+                if h is None:
+                    h = heuristic(child[0], problem)
+                    hCache[child[0]] = h
+
+                parents.append((index, child[1]))
+                heapq.heappush(frontier, (childCost + h, len(parents) - 1, child[0], childCost))
+
+    return None